@@ -0,0 +1,308 @@
+"""
+Offline load benchmarks for server1.py.
+
+Starts the server from a scratch copy of the repository (so users.db and the
+logs are never touched), drives one request mix per scenario from a pool of
+keep-alive client threads and reports throughput, p50/p95/p99 latency and the
+server's RSS after each scenario.
+
+    python benchmarks/bench.py                         # all scenarios, print results
+    python benchmarks/bench.py --save benchmarks/baseline.json
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+    python benchmarks/bench.py -s login_burst -s bogus_flood --server-args="--async"
+
+With --compare the run fails (exit status 1) when a scenario's throughput
+drops, or its p95 latency grows, by more than --tolerance (default 25%).
+Numbers are only comparable between runs on the same machine.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import signal
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST, PORT = 'localhost', 8000
+ADMIN_TOKEN = 'bench-admin'
+
+# Files copied into the scratch directory the server runs in.
+SERVED_FILES = [
+    'server1.py', 'question_banks.json', 'index.html', 'style.css', 'script.js',
+    'DRDO-Round1-Main.html', 'interview_Round2_Main.html', 'qb2.html', 'resume.html',
+]
+
+STATIC_PAGES = ['/', '/index.html', '/style.css', '/script.js', '/DRDO-Round1-Main.html']
+
+BOGUS_PATHS = [
+    '/Index.htm', '/INDEX.HTML', '/scirpt.js', '/styles.css', '/drdo-round1-main.html',
+    '/DRDO_Round1_Main.html', '/interview-round2-main.html', '/resume', '/qb2', '/assets/js/script.js',
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def read_rss_kb(pid):
+    """(VmRSS, VmHWM) of a process in KiB, or (None, None) where /proc is unavailable."""
+    try:
+        with open('/proc/%d/status' % pid) as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+# --- request mixes ----------------------------------------------------------
+# Each returns (method, path, body, headers) for request number i of a worker.
+
+def login_burst(rng, i):
+    """
+    Candidates logging in at the start of an exam slot; most are returning
+    users. Every login carries a password, so each request costs one scrypt
+    hash (a registration or a verification), as real logins do.
+    """
+    n = rng.randrange(5000) if rng.random() < 0.2 else rng.randrange(300)
+    body = json.dumps({'email': 'bench%d@example.in' % n, 'password': 'bench-password-%d' % n,
+                       'full_name': 'Bench Candidate %d' % n, 'phone': '98%08d' % n}).encode()
+    return 'POST', '/api/login', body, {'Content-Type': 'application/json'}
+
+
+def static_pages(rng, i):
+    """Page loads: the landing page plus its assets, as a browser with gzip fetches them."""
+    return 'GET', rng.choice(STATIC_PAGES), None, {'Accept-Encoding': 'gzip, br'}
+
+
+def admin_polling(rng, i):
+    """The admin dashboard refreshing the user list and the results summary."""
+    roll = rng.random()
+    if roll < 0.6:
+        return 'GET', '/api/users?limit=100', None, {'Accept-Encoding': 'gzip', 'X-Admin-Token': ADMIN_TOKEN}
+    if roll < 0.8:
+        return 'GET', '/api/users?limit=50&fields=id,email,created_at', None, {'X-Admin-Token': ADMIN_TOKEN}
+    return 'GET', '/api/results/summary', None, {'X-Admin-Token': ADMIN_TOKEN}
+
+
+def bogus_flood(rng, i):
+    """Mistyped and made-up URLs that fall through to find_similar_file."""
+    if rng.random() < 0.5:
+        return 'GET', rng.choice(BOGUS_PATHS), None, {}
+    return 'GET', '/missing-%d/page-%d.html' % (rng.randrange(50), rng.randrange(1000)), None, {}
+
+
+SCENARIOS = {
+    'login_burst': login_burst,
+    'static_pages': static_pages,
+    'admin_polling': admin_polling,
+    'bogus_flood': bogus_flood,
+}
+
+
+# --- server process ---------------------------------------------------------
+
+def wait_for_port(proc, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError('server exited with status %s during startup' % proc.returncode)
+        try:
+            conn = http.client.HTTPConnection(HOST, PORT, timeout=1)
+            conn.request('GET', '/readyz')
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            # 503 until the server has warmed its caches
+            if response.status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError('server did not become ready on %s:%d' % (HOST, PORT))
+
+
+def start_server(workdir, server_args):
+    for name in SERVED_FILES:
+        src = os.path.join(REPO_DIR, name)
+        if os.path.exists(src):
+            shutil.copy2(src, workdir)
+    # All clients share one address; lift the per-client fuzzy-lookup limit so
+    # bogus_flood keeps measuring the lookups themselves.
+    cmd = [sys.executable, 'server1.py', '--host', HOST, '--port', str(PORT), '--access-log-sample', '0',
+           '--rate-limit', 'fuzzy=0', '--admin-token', ADMIN_TOKEN] + server_args
+    log = open(os.path.join(workdir, 'stdout.log'), 'wb')
+    proc = subprocess.Popen(cmd, cwd=workdir, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_for_port(proc)
+    except Exception:
+        stop_server(proc)
+        raise
+    return proc
+
+
+def stop_server(proc):
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+# --- load generation --------------------------------------------------------
+
+def run_scenario(name, make_request, concurrency, duration, seed):
+    """Drive one mix for `duration` seconds from `concurrency` keep-alive clients."""
+    deadline = time.perf_counter() + duration
+    results = []
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random('%s:%s:%d' % (name, seed, index))
+        latencies, statuses, errors, nbytes = [], {}, 0, 0
+        conn = http.client.HTTPConnection(HOST, PORT, timeout=30)
+        i = 0
+        while time.perf_counter() < deadline:
+            method, path, body, headers = make_request(rng, i)
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(HOST, PORT, timeout=30)
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+            nbytes += len(data)
+            if response.will_close:
+                conn.close()
+                conn = http.client.HTTPConnection(HOST, PORT, timeout=30)
+        conn.close()
+        with lock:
+            results.append((latencies, statuses, errors, nbytes))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for r in results for l in r[0])
+    statuses = {}
+    for r in results:
+        for status, count in r[1].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    return {
+        'requests': len(latencies),
+        'errors': sum(r[2] for r in results),
+        'statuses': dict(sorted(statuses.items())),
+        'bytes': sum(r[3] for r in results),
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return a list of regression messages for scenarios present in both runs."""
+    problems = []
+    for name, result in current['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        if result['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            problems.append('%s: throughput %.1f req/s vs baseline %.1f' % (
+                name, result['throughput_rps'], base['throughput_rps']))
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            problems.append('%s: p95 %.2f ms vs baseline %.2f' % (name, result['p95_ms'], base['p95_ms']))
+    return problems
+
+
+def main(argv=None):
+    global PORT
+    parser = argparse.ArgumentParser(description='Load benchmarks for server1.py')
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable; default: all)')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='Concurrent keep-alive clients')
+    parser.add_argument('-d', '--duration', type=float, default=5.0, help='Seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Unmeasured seconds before each scenario')
+    parser.add_argument('--seed', default='1', help='Seed for the request mixes')
+    parser.add_argument('--port', type=int, default=PORT, help='Port for the benchmarked server')
+    parser.add_argument('--server-args', default='', help='Extra arguments for server1.py, e.g. "--async --workers 64"')
+    parser.add_argument('--save', metavar='PATH', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression for --compare')
+    args = parser.parse_args(argv)
+    PORT = args.port
+
+    names = args.scenario or list(SCENARIOS)
+    run = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'server_args': args.server_args,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'scenarios': {},
+    }
+    workdir = tempfile.mkdtemp(prefix='drdo-bench-')
+    proc = start_server(workdir, args.server_args.split())
+    try:
+        print('%-14s %10s %9s %9s %9s %9s %8s %9s' % (
+            'scenario', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors', 'RSS MiB'))
+        for name in names:
+            if args.warmup > 0:
+                run_scenario(name, SCENARIOS[name], args.concurrency, args.warmup, 'warmup')
+            result = run_scenario(name, SCENARIOS[name], args.concurrency, args.duration, args.seed)
+            rss, peak = read_rss_kb(proc.pid)
+            result['rss_kb'] = rss
+            result['peak_rss_kb'] = peak
+            run['scenarios'][name] = result
+            print('%-14s %10d %9.1f %9.2f %9.2f %9.2f %8d %9s' % (
+                name, result['requests'], result['throughput_rps'], result['p50_ms'], result['p95_ms'],
+                result['p99_ms'], result['errors'], '%.1f' % (rss / 1024) if rss else '-'))
+    finally:
+        stop_server(proc)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(run, f, indent=2)
+            f.write('\n')
+        print('Saved baseline to %s' % args.save)
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(run, json.load(f), args.tolerance)
+        for problem in problems:
+            print('REGRESSION ' + problem)
+        if problems:
+            return 1
+        print('No regressions against %s' % args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
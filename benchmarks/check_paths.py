@@ -0,0 +1,84 @@
+"""
+Path traversal check for the file-serving routes of server1.py.
+
+Runs the server from a scratch copy of the repository and requests the
+private files (the answer key, the database, the server source and the
+log) through '..' segments under the static and AI simulation routes, as
+curl --path-as-is would send them, plus a file in a sibling directory
+whose name starts with the served directory's. None of them may come back.
+
+    python benchmarks/check_paths.py
+    python benchmarks/check_paths.py --server-args="--async"
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import http.client
+
+import bench
+
+PRIVATE = ['question_banks.json', 'users.db', 'server1.py', 'server.log']
+PREFIXES = ['', '/ai', '/ai-simulation', '/simulate', '/ai-simulate', '/ai/x', '/simulate/x']
+
+
+def fetch(path):
+    # http.client sends the path as given; '..' segments reach the server.
+    conn = http.client.HTTPConnection(bench.HOST, bench.PORT, timeout=30)
+    conn.request('GET', path)
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, body
+
+
+def leaked(path, body):
+    """True when body is (a prefix of) the file at path."""
+    with open(path, 'rb') as f:
+        head = f.read(256)
+    return bool(head) and body.startswith(head)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check server1.py for path traversal')
+    parser.add_argument('--port', type=int, default=bench.PORT, help='Port for the checked server')
+    parser.add_argument('--server-args', default='', help='Extra arguments for server1.py, e.g. "--async"')
+    args = parser.parse_args(argv)
+    bench.PORT = args.port
+
+    workdir = tempfile.mkdtemp(prefix='drdo-pathcheck-')
+    sibling = workdir + '2'
+    os.mkdir(sibling)
+    with open(os.path.join(sibling, 'secret.txt'), 'w') as f:
+        f.write('sibling directory secret\n')
+    proc = bench.start_server(workdir, args.server_args.split())
+    failures = []
+    try:
+        # Make sure the database and the log have content to leak.
+        fetch('/index.html')
+        # (file, name to request, extra '..' segments needed to reach it)
+        targets = [(os.path.join(workdir, name), name, 0) for name in PRIVATE]
+        targets.append((os.path.join(sibling, 'secret.txt'), os.path.basename(sibling) + '/secret.txt', 1))
+        for prefix in PREFIXES:
+            for path, name, up in targets:
+                request = prefix + '/..' * (prefix.count('/') + up) + '/' + name
+                status, body = fetch(request)
+                if status == 200 and leaked(path, body):
+                    failures.append(request)
+                    print('FAIL %-44s %d' % (request, status))
+                else:
+                    print('ok   %-44s %d' % (request, status))
+    finally:
+        bench.stop_server(proc)
+        shutil.rmtree(sibling, ignore_errors=True)
+    if failures:
+        print('server output: %s' % os.path.join(workdir, 'stdout.log'))
+        return 1
+    shutil.rmtree(workdir, ignore_errors=True)
+    print('No private file served')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
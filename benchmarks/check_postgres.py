@@ -0,0 +1,161 @@
+"""
+Functional check of the PostgreSQL code paths of server1.py.
+
+Runs the server with a postgresql:// --db-url against the psycopg2 stand-in
+in benchmarks/pgstandin (no PostgreSQL server needed), drives one candidate
+and one admin through the API, restarts the server and checks that
+
+  * every statement uses PostgreSQL syntax and '%s' placeholders, and every
+    integer fits its column (the stand-in refuses anything else),
+  * registration uses INSERT ... RETURNING, the group-commit writer (always
+    on here) uses savepoints and schema creation takes the advisory lock,
+  * the schema version is kept in schema_version, so the restart skips the
+    DDL, and events answered with 202 survive the restart.
+
+    python benchmarks/check_postgres.py
+    python benchmarks/check_postgres.py --server-args="--async"
+
+To run against a real PostgreSQL instead, start server1.py with
+--db-url postgresql://... and point this script's requests at it by hand;
+the stand-in only exists so the check runs anywhere.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import http.client
+
+import bench
+
+STANDIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pgstandin')
+DB_URL = 'postgresql://standin/drdo'
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def call(method, path, body=None, headers=None, raw=None):
+    conn = http.client.HTTPConnection(bench.HOST, bench.PORT, timeout=30)
+    data = raw if raw is not None else json.dumps(body).encode() if body is not None else None
+    conn.request(method, path, data, headers or {})
+    response = conn.getresponse()
+    payload = response.read()
+    conn.close()
+    try:
+        return response.status, json.loads(payload)
+    except ValueError:
+        return response.status, payload
+
+
+def expect(label, status, payload, wanted):
+    if status != wanted:
+        raise CheckFailed('%s: expected %d, got %d %r' % (label, wanted, status, payload))
+    print('ok   %-28s %d' % (label, status))
+    return payload
+
+
+def run_candidate_and_admin():
+    """Drive the API once; returns the exam session id the events were posted to."""
+    admin = {'X-Admin-Token': bench.ADMIN_TOKEN}
+    account = {'email': 'pgcheck@example.in', 'password': 'pgcheck-password',
+               'full_name': 'PG Check', 'phone': '9800000000'}
+    expect('register', *call('POST', '/api/users', account), 201)
+    token = expect('login', *call('POST', '/api/login', account), 200)['token']
+    auth = {'Authorization': 'Bearer ' + token}
+    session = expect('start exam', *call('POST', '/api/sessions', {'domain': 'cse', 'n': 5}, auth), 201)['session']
+    answers = [{'question_id': q['id'], 'answer': 0} for q in session['questions']]
+    expect('partial answers', *call('POST', '/api/results', {'token': session['token'], 'answers': answers[:2]},
+                                    auth), 200)
+    result = expect('final answers', *call('POST', '/api/results', {
+        'token': session['token'], 'answers': answers, 'final': True}, auth), 200)['result']
+    # Browser clients send Date.now(), milliseconds since the epoch.
+    events = [{'type': 'blur', 't': int(time.time() * 1000)}, {'type': 'focus', 't': int(time.time() * 1000)}]
+    expect('post events', *call('POST', '/api/events', {'token': session['token'], 'events': events}, auth), 202)
+
+    imported = expect('import users', *call('POST', '/api/users/import', headers=dict(admin, **{
+        'Content-Type': 'text/csv'}), raw=b'email,full_name\npgimport1@example.in,A\npgcheck@example.in,B\n'), 200)
+    if imported['import'].get('created') != 1:
+        raise CheckFailed('import users: expected one new account, got %r' % imported['import'])
+    tokens = expect('setup tokens', *call('POST', '/api/users/setup-tokens',
+                                          {'emails': ['pgimport1@example.in']}, admin), 200)['tokens']
+    expect('set password', *call('POST', '/api/users/password', {
+        'token': tokens['pgimport1@example.in'], 'password': 'imported-password'}), 200)
+    expect('imported login', *call('POST', '/api/login', {
+        'email': 'pgimport1@example.in', 'password': 'imported-password'}), 200)
+
+    expect('results summary', *call('GET', '/api/results/summary', headers=admin), 200)
+    expect('results page', *call('GET', '/api/results?limit=1', headers=admin), 200)
+    expect('users page', *call('GET', '/api/users?limit=1', headers=admin), 200)
+    expect('delete result', *call('DELETE', '/api/results?id=%d' % result['id'], headers=admin), 200)
+    return session['id']
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def check_statements(label, statements, wanted):
+    for needle in wanted:
+        if not any(needle in statement for statement in statements):
+            raise CheckFailed('%s: no statement containing %r' % (label, needle))
+    print('ok   %-28s %d statements' % (label, len(statements)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the PostgreSQL code paths of server1.py')
+    parser.add_argument('--port', type=int, default=bench.PORT, help='Port for the checked server')
+    parser.add_argument('--server-args', default='', help='Extra arguments for server1.py, e.g. "--async"')
+    args = parser.parse_args(argv)
+    bench.PORT = args.port
+
+    workdir = tempfile.mkdtemp(prefix='drdo-pgcheck-')
+    sql_log = os.path.join(workdir, 'statements.log')
+    os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, [STANDIN_DIR, os.environ.get('PYTHONPATH')]))
+    os.environ['PGSTANDIN_DB'] = os.path.join(workdir, 'standin.db')
+    os.environ['PGSTANDIN_LOG'] = sql_log
+    server_args = ['--db-url', DB_URL, '--group-commit'] + args.server_args.split()
+    proc = None
+    try:
+        proc = bench.start_server(workdir, server_args)
+        session_id = run_candidate_and_admin()
+        bench.stop_server(proc)
+        first_run = read_log(sql_log)
+        check_statements('first run', first_run, [
+            'pg_advisory_xact_lock', 'CREATE TABLE IF NOT EXISTS schema_version', 'BIGSERIAL PRIMARY KEY',
+            'INSERT INTO schema_version', 'RETURNING', 'SAVEPOINT row_savepoint', 'RELEASE SAVEPOINT',
+            'INSERT INTO exam_events', 'ALTER COLUMN client_ts TYPE BIGINT',
+        ])
+
+        proc = bench.start_server(workdir, server_args)
+        events = expect('events after restart', *call('GET', '/api/events?session_id=%d' % session_id, headers={
+            'X-Admin-Token': bench.ADMIN_TOKEN}), 200)['events']
+        if [e['type'] for e in events] != ['blur', 'focus']:
+            raise CheckFailed('events after restart: expected blur and focus, got %r' % events)
+        bench.stop_server(proc)
+        proc = None
+        second_run = read_log(sql_log)[len(first_run):]
+        ddl = [s for s in second_run if s.startswith('CREATE TABLE') and 'schema_version' not in s]
+        if ddl:
+            raise CheckFailed('restart re-ran the schema: %r' % ddl[0])
+        print('ok   %-28s %d statements' % ('restart skips schema', len(second_run)))
+    except CheckFailed as e:
+        print('FAIL ' + str(e))
+        print('server output: %s' % os.path.join(workdir, 'stdout.log'))
+        return 1
+    finally:
+        if proc is not None:
+            bench.stop_server(proc)
+    shutil.rmtree(workdir, ignore_errors=True)
+    print('PostgreSQL code paths OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
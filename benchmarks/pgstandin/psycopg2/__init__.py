@@ -0,0 +1,112 @@
+"""
+A stand-in for psycopg2 for checking the PostgreSQL code paths of server1.py
+without a PostgreSQL server (see benchmarks/check_postgres.py).
+
+It implements the small part of the psycopg2 API PostgresPool uses over one
+SQLite file ($PGSTANDIN_DB) and refuses SQL that PostgreSQL would refuse:
+sqlite3 '?' placeholders, non-tuple parameters, SQLite-only syntax and
+integers that do not fit the declared column type. The few PostgreSQL-only
+constructs the server emits are mapped back to SQLite before running them.
+Every statement is appended to $PGSTANDIN_LOG when it is set.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+DatabaseError = sqlite3.DatabaseError
+
+_NOW_SQL = "to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS')"
+_SQLITE_ONLY = ['AUTOINCREMENT', 'WITHOUT ROWID', 'INSERT OR ', 'PRAGMA', 'CURRENT_TIMESTAMP', 'datetime(']
+_TO_SQLITE = [
+    (_NOW_SQL, 'CURRENT_TIMESTAMP'),
+    ('BIGSERIAL PRIMARY KEY', 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+]
+_RANGES = {
+    'INTEGER': (-2 ** 31, 2 ** 31 - 1),
+    'BIGINT': (-2 ** 63, 2 ** 63 - 1),
+}
+_log_lock = threading.Lock()
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self._conn = conn
+        self._cursor = conn.raw.cursor()
+        self.rowcount = -1
+
+    def execute(self, sql, params=()):
+        if not isinstance(params, tuple):
+            raise DatabaseError('parameters must be a tuple, got %r' % type(params).__name__)
+        if '?' in sql:
+            raise DatabaseError('sqlite3 placeholder in %r' % sql)
+        for syntax in _SQLITE_ONLY:
+            if syntax in sql.replace(_NOW_SQL, ''):
+                raise DatabaseError('SQLite-only syntax %r in %r' % (syntax, sql))
+        log = os.environ.get('PGSTANDIN_LOG')
+        if log:
+            with _log_lock, open(log, 'a') as f:
+                f.write(' '.join(sql.split()) + '\n')
+        if sql.startswith('ALTER TABLE') and ' TYPE ' in sql:
+            # SQLite columns take any type; nothing to change
+            self.rowcount = -1
+            return
+        for old, new in _TO_SQLITE:
+            sql = sql.replace(old, new)
+        sql = sql.replace('%s', '?').replace('%%', '%')
+        self._check_ranges(sql, params)
+        self._cursor.execute(sql, params)
+        self.rowcount = self._cursor.rowcount
+
+    def _check_ranges(self, sql, params):
+        # PostgreSQL raises "integer out of range" where SQLite would store
+        # any 64-bit value, so compare each bound integer with the type of
+        # the column it is written to.
+        match = re.match(r'\s*INSERT INTO (\w+) \(([^)]*)\)', sql)
+        if not match:
+            return
+        types = self._conn.column_types(match.group(1))
+        columns = [c.strip() for c in match.group(2).split(',')]
+        for column, value in zip(columns, params):
+            bounds = _RANGES.get(types.get(column))
+            if bounds and isinstance(value, int) and not bounds[0] <= value <= bounds[1]:
+                raise DatabaseError('integer out of range for %s.%s' % (match.group(1), column))
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+
+class _Connection:
+    closed = 0
+
+    def __init__(self, path):
+        self.raw = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self.raw.create_function('GREATEST', 2, max)
+        self.raw.create_function('pg_advisory_xact_lock', 1, lambda key: None)
+
+    def column_types(self, table):
+        types = {}
+        for _, name, decl, _, _, pk in self.raw.execute('PRAGMA table_info(%s)' % table):
+            # the primary keys are BIGSERIAL on PostgreSQL
+            types[name] = 'BIGINT' if pk else decl.split()[0].upper() if decl else ''
+        return types
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.closed = 1
+        self.raw.close()
+
+
+def connect(dsn, connect_timeout=None):
+    return _Connection(os.environ.get('PGSTANDIN_DB', 'pgstandin.db'))
@@ -805,6 +805,7 @@ function saveUserToStorage(user) {
 // Remove user from localStorage (logout)
 function removeUserFromStorage() {
     localStorage.removeItem('drdoCurrentUser');
+    localStorage.removeItem('authToken');
     currentUser = null;
     updateUserDisplay(null);
 }
@@ -878,10 +879,15 @@ function closeVideoModal() {
     }
 }
 
+// Base URL of the API. Empty means the origin the page was served from,
+// so the pages work behind a load balancer and on any host/port; set
+// window.DRDO_API_BASE before this script to use a separate API host.
+const API_BASE = window.DRDO_API_BASE || '';
+
 // Function to store user on server
 async function storeUserOnServer(userData) {
     try {
-        const response = await fetch('http://localhost:8000/api/login', {
+        const response = await fetch(`${API_BASE}/api/login`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -889,6 +895,12 @@ async function storeUserOnServer(userData) {
             body: JSON.stringify(userData)
         });
         
+        if (response.status === 401) {
+            // Wrong password: the server answered, so no offline fallback
+            const result = await response.json();
+            return { success: false, rejected: true, message: result.message };
+        }
+        
         if (!response.ok) {
             throw new Error(`Server error: ${response.status}`);
         }
@@ -939,12 +951,19 @@ async function handleLoginFormSubmit(e) {
         // Try to store on server first
         const serverResponse = await storeUserOnServer(userData);
         
+        if (serverResponse.rejected) {
+            showMessage(serverResponse.message || 'Invalid email or password', 'error');
+            return;
+        }
+        
         if (serverResponse.success) {
-            // Server storage successful
+            // Server storage successful; keep the session token, never the password
+            const { password: _password, ...profile } = userData;
             const userToSave = {
-                ...userData,
-                id: serverResponse.userId || Date.now()
+                ...profile,
+                id: serverResponse.user ? serverResponse.user.id : Date.now()
             };
+            localStorage.setItem('authToken', serverResponse.token);
             
             // Store locally as backup
             try {
@@ -1233,7 +1252,7 @@ document.addEventListener('DOMContentLoaded', function() {
             }
 
             // Send login request to server
-            fetch('/api/login', {
+            fetch(`${API_BASE}/api/login`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -1251,6 +1270,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 if (data.success) {
                     // Store user data in localStorage
                     localStorage.setItem('user', JSON.stringify(data.user));
+                    localStorage.setItem('authToken', data.token);
                     localStorage.setItem('isLoggedIn', 'true');
 
                     showLoginMessage('Login successful!', 'success');
@@ -1278,6 +1298,7 @@ document.addEventListener('DOMContentLoaded', function() {
     if (logoutBtn) {
         logoutBtn.addEventListener('click', function() {
             localStorage.removeItem('user');
+            localStorage.removeItem('authToken');
             localStorage.removeItem('isLoggedIn');
 
             // Hide user display and show login button